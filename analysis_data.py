@@ -1,12 +1,21 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import copy
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import pandas as pd
+import polars as pl
 
-DATASET_PATH = Path(__file__).with_name("movies_dataset.csv")
+from io_utils import DATASET_PATH, scan_movies
+
+ANALYSIS_COLUMNS = ["Movie Name", "genre", "Release Year", "Budget", "Revenue", "Profit"]
+NUMERIC_COLUMNS = ["Budget", "Revenue", "Profit", "Release Year"]
+CORRELATION_METRICS = ["Budget", "Revenue", "Profit"]
+
+# A lazy query paired with the function that turns its collected frame into JSON-ready rows.
+Aggregate = Tuple[pl.LazyFrame, Callable[[pl.DataFrame], List[Dict[str, Any]]]]
 
 
 @dataclass
@@ -14,69 +23,137 @@ class MovieAnalytics:
     """Prepare reusable aggregates for the analysis dashboard."""
 
     dataframe: pd.DataFrame
+    _summary_cache: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
 
     @classmethod
-    def from_dataset(cls, dataset_path: Path = DATASET_PATH) -> "MovieAnalytics":
-        df = pd.read_csv(dataset_path)
-        numeric_cols = ["Budget", "Revenue", "Profit"]
-        df[numeric_cols] = df[numeric_cols].apply(pd.to_numeric, errors="coerce")
-        df["Release Year"] = pd.to_numeric(df["Release Year"], errors="coerce")
-        df.dropna(subset=numeric_cols + ["Release Year"], inplace=True)
-        df = df[df["Budget"] > 0]
-        return cls(dataframe=df.reset_index(drop=True))
+    def from_dataset(
+        cls,
+        dataset_path: Path = DATASET_PATH,
+        dataframe: Optional[pd.DataFrame] = None,
+    ) -> "MovieAnalytics":
+        """Build analytics from ``dataframe`` when already parsed, else from ``dataset_path``."""
+        if dataframe is not None:
+            frame = pl.from_pandas(dataframe[ANALYSIS_COLUMNS]).lazy()
+        elif dataset_path.exists():
+            frame = scan_movies(dataset_path)
+        else:
+            raise FileNotFoundError(f"Dataset not found: {dataset_path}")
+
+        df = (
+            frame.select(ANALYSIS_COLUMNS)
+            .with_columns(pl.col(NUMERIC_COLUMNS).cast(pl.Float64, strict=False))
+            .drop_nulls(subset=NUMERIC_COLUMNS)
+            .filter(pl.col("Budget") > 0)
+            .collect()
+            .to_pandas()
+        )
+        return cls(dataframe=df)
 
     def top_genres_by_average_profit(self, n: int = 8) -> List[Dict[str, Any]]:
-        series = (
-            self.dataframe.groupby("genre")["Profit"].mean().sort_values(ascending=False).head(n)
+        return _collect(self._top_genres_by_average_profit(self._lazy_frame(), n))
+
+    def median_profit_margin_by_genre(self, n: int = 8) -> List[Dict[str, Any]]:
+        return _collect(self._median_profit_margin_by_genre(self._lazy_frame(), n))
+
+    def revenue_profit_trend(self) -> List[Dict[str, Any]]:
+        return _collect(self._revenue_profit_trend(self._lazy_frame()))
+
+    def metric_correlations(self) -> List[Dict[str, Any]]:
+        return _collect(self._metric_correlations(self._lazy_frame()))
+
+    def top_movies_by_profit_and_margin(self, n: int = 6) -> List[Dict[str, Any]]:
+        return _collect(self._top_movies_by_profit_and_margin(self._lazy_frame(), n))
+
+    def summary_payload(self) -> Dict[str, Any]:
+        """Return every dashboard aggregate; memoised per instance since the dataframe is fixed after load."""
+        if self._summary_cache is None:
+            self._summary_cache = self._build_summary_payload()
+        return copy.deepcopy(self._summary_cache)
+
+    def _build_summary_payload(self) -> Dict[str, Any]:
+        lf = self._lazy_frame()
+        aggregates = {
+            "top_genres_average_profit": self._top_genres_by_average_profit(lf),
+            "median_profit_margin_by_genre": self._median_profit_margin_by_genre(lf),
+            "revenue_profit_trend": self._revenue_profit_trend(lf),
+            "metric_correlations": self._metric_correlations(lf),
+            "top_movies_by_profit_and_margin": self._top_movies_by_profit_and_margin(lf),
+        }
+        # One collect_all so the shared margin projection is computed once for every query.
+        frames = pl.collect_all([query for query, _ in aggregates.values()])
+        return {
+            key: format_rows(frame)
+            for (key, (_, format_rows)), frame in zip(aggregates.items(), frames)
+        }
+
+    def _lazy_frame(self) -> pl.LazyFrame:
+        return (
+            pl.from_pandas(self.dataframe)
+            .lazy()
+            .with_columns((pl.col("Profit") / pl.col("Budget")).alias("margin"))
+        )
+
+    @staticmethod
+    def _top_genres_by_average_profit(lf: pl.LazyFrame, n: int = 8) -> Aggregate:
+        query = (
+            lf.drop_nulls("genre")
+            .group_by("genre")
+            .agg(pl.col("Profit").mean())
+            .sort("Profit", descending=True, maintain_order=True)
+            .head(n)
         )
-        return [
+        return query, lambda frame: [
             {"genre": genre, "average_profit": float(round(value / 1_000_000, 2))}
-            for genre, value in series.items()
+            for genre, value in frame.iter_rows()
         ]
 
-    def median_profit_margin_by_genre(self, n: int = 8) -> List[Dict[str, Any]]:
-        df = self.dataframe.copy()
-        df["margin"] = df["Profit"] / df["Budget"]
-        series = df.groupby("genre")["margin"].median().sort_values(ascending=False).head(n)
-        return [
+    @staticmethod
+    def _median_profit_margin_by_genre(lf: pl.LazyFrame, n: int = 8) -> Aggregate:
+        query = (
+            lf.drop_nulls("genre")
+            .group_by("genre")
+            .agg(pl.col("margin").median())
+            .sort("margin", descending=True, maintain_order=True)
+            .head(n)
+        )
+        return query, lambda frame: [
             {"genre": genre, "median_margin": float(round(value, 3))}
-            for genre, value in series.items()
+            for genre, value in frame.iter_rows()
         ]
 
-    def revenue_profit_trend(self) -> List[Dict[str, Any]]:
-        trend = (
-            self.dataframe.groupby("Release Year")[["Revenue", "Profit"]]
-            .mean()
-            .sort_index()
+    @staticmethod
+    def _revenue_profit_trend(lf: pl.LazyFrame) -> Aggregate:
+        query = (
+            lf.group_by("Release Year")
+            .agg(pl.col("Revenue").mean(), pl.col("Profit").mean())
+            .sort("Release Year")
         )
-        return [
+        return query, lambda frame: [
             {
                 "release_year": int(year),
-                "average_revenue": float(round(values["Revenue"] / 1_000_000, 2)),
-                "average_profit": float(round(values["Profit"] / 1_000_000, 2)),
+                "average_revenue": float(round(revenue / 1_000_000, 2)),
+                "average_profit": float(round(profit / 1_000_000, 2)),
             }
-            for year, values in trend.iterrows()
+            for year, revenue, profit in frame.select("Release Year", "Revenue", "Profit").iter_rows()
         ]
 
-    def metric_correlations(self) -> List[Dict[str, Any]]:
-        metrics = ["Budget", "Revenue", "Profit"]
-        corr_matrix = self.dataframe[metrics].corr().round(3)
-        pairs: List[Dict[str, Any]] = []
-        for idx, metric in enumerate(metrics):
-            for other in metrics[idx + 1 :]:
-                pairs.append(
-                    {
-                        "pair": f"{metric} vs {other}",
-                        "value": float(corr_matrix.loc[metric, other]),
-                    }
-                )
-        return pairs
+    @staticmethod
+    def _metric_correlations(lf: pl.LazyFrame) -> Aggregate:
+        metrics = CORRELATION_METRICS
+        query = lf.select(
+            pl.corr(metric, other).alias(f"{metric} vs {other}")
+            for idx, metric in enumerate(metrics)
+            for other in metrics[idx + 1 :]
+        )
+        return query, lambda frame: [
+            {"pair": pair, "value": float(round(value, 3))}
+            for pair, value in frame.row(0, named=True).items()
+        ]
 
-    def top_movies_by_profit_and_margin(self, n: int = 6) -> List[Dict[str, Any]]:
-        df = self.dataframe.copy()
-        df["margin"] = df["Profit"] / df["Budget"]
-        ranked = df.sort_values(by=["Profit", "margin"], ascending=False).head(n)
-        return [
+    @staticmethod
+    def _top_movies_by_profit_and_margin(lf: pl.LazyFrame, n: int = 6) -> Aggregate:
+        query = lf.sort(["Profit", "margin"], descending=True, maintain_order=True).head(n)
+        return query, lambda frame: [
             {
                 "title": row["Movie Name"],
                 "genre": row["genre"],
@@ -85,14 +162,10 @@ class MovieAnalytics:
                 "profit": float(round(row["Profit"] / 1_000_000, 2)),
                 "margin": float(round(row["margin"], 2)),
             }
-            for _, row in ranked.iterrows()
+            for row in frame.iter_rows(named=True)
         ]
 
-    def summary_payload(self) -> Dict[str, Any]:
-        return {
-            "top_genres_average_profit": self.top_genres_by_average_profit(),
-            "median_profit_margin_by_genre": self.median_profit_margin_by_genre(),
-            "revenue_profit_trend": self.revenue_profit_trend(),
-            "metric_correlations": self.metric_correlations(),
-            "top_movies_by_profit_and_margin": self.top_movies_by_profit_and_margin(),
-        }
\ No newline at end of file
+
+def _collect(aggregate: Aggregate) -> List[Dict[str, Any]]:
+    query, format_rows = aggregate
+    return format_rows(query.collect())
@@ -1,24 +1,51 @@
 from __future__ import annotations
 
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Union
 
-from fastapi import FastAPI, HTTPException
+import orjson
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import HTMLResponse, ORJSONResponse, Response
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel, Field
 
 from analysis_data import MovieAnalytics
+from io_utils import load_movies
 from rag_cli import MovieRAG
 
+try:
+    from brotli_asgi import BrotliMiddleware  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    BrotliMiddleware = None  # type: ignore
+
 APP_TITLE = "Movie Suggestion Bot"
 APP_DESCRIPTION = "Discover movies with fast semantic search."
 FRONTEND_DIR = Path(__file__).parent / "frontend"
 INDEX_FILE = FRONTEND_DIR / "index.html"
 ANALYSIS_FILE = FRONTEND_DIR / "analysis.html"
+ANALYSIS_CACHE_CONTROL = "public, max-age=3600, stale-while-revalidate=60"
+HTML_CACHE_CONTROL = "public, max-age=300"
+COMPRESSION_MIN_SIZE = 512
+
+
+@asynccontextmanager
+async def _lifespan(_: FastAPI) -> AsyncIterator[None]:
+    # Warm the encoder before serving so the first search doesn't pay for lazy initialisation.
+    rag.warm_up()
+    yield
+
 
-app = FastAPI(title=APP_TITLE, description=APP_DESCRIPTION)
+app = FastAPI(
+    title=APP_TITLE,
+    description=APP_DESCRIPTION,
+    default_response_class=ORJSONResponse,
+    lifespan=_lifespan,
+)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -26,12 +53,33 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+if BrotliMiddleware is not None:
+    # Falls back to gzip for clients that don't accept br.
+    app.add_middleware(BrotliMiddleware, quality=4, minimum_size=COMPRESSION_MIN_SIZE)
+else:
+    app.add_middleware(GZipMiddleware, minimum_size=COMPRESSION_MIN_SIZE)
 
 if FRONTEND_DIR.exists():
     app.mount("/static", StaticFiles(directory=FRONTEND_DIR), name="static")
 
-rag = MovieRAG()
-analytics = MovieAnalytics.from_dataset()
+# Parse the dataset once and build the search index and analytics side by side.
+_movies = load_movies()
+with ThreadPoolExecutor(max_workers=2) as _executor:
+    _rag_future = _executor.submit(MovieRAG, dataframe=_movies)
+    _analytics_future = _executor.submit(MovieAnalytics.from_dataset, dataframe=_movies)
+    rag = _rag_future.result()
+    analytics = _analytics_future.result()
+
+# The analysis aggregates never change after startup, so serialise them once.
+_ANALYSIS_CACHE = analytics.summary_payload()
+_ANALYSIS_BODY = orjson.dumps(_ANALYSIS_CACHE)
+_ANALYSIS_ETAG = f'"{hashlib.md5(_ANALYSIS_BODY).hexdigest()}"'
+
+# The HTML shells are static too; read them once instead of on every request.
+INDEX_HTML = INDEX_FILE.read_bytes() if INDEX_FILE.exists() else None
+ANALYSIS_HTML = ANALYSIS_FILE.read_bytes() if ANALYSIS_FILE.exists() else None
+_INDEX_ETAG = f'"{hashlib.md5(INDEX_HTML).hexdigest()}"' if INDEX_HTML is not None else ""
+_ANALYSIS_HTML_ETAG = f'"{hashlib.md5(ANALYSIS_HTML).hexdigest()}"' if ANALYSIS_HTML is not None else ""
 
 
 class SearchRequest(BaseModel):
@@ -53,26 +101,45 @@ class SearchResponse(BaseModel):
 
 
 @app.get("/", response_class=HTMLResponse)
-def serve_index() -> str:
-    if not INDEX_FILE.exists():
+def serve_index(request: Request) -> Response:
+    if INDEX_HTML is None:
         raise HTTPException(status_code=404, detail="Frontend not found")
-    return INDEX_FILE.read_text(encoding="utf-8")
+    return _cached_response(request, INDEX_HTML, _INDEX_ETAG, "text/html; charset=utf-8", HTML_CACHE_CONTROL)
 
 
 @app.get("/analysis", response_class=HTMLResponse)
-def serve_analysis() -> str:
-    if not ANALYSIS_FILE.exists():
+def serve_analysis(request: Request) -> Response:
+    if ANALYSIS_HTML is None:
         raise HTTPException(status_code=404, detail="Analysis frontend not found")
-    return ANALYSIS_FILE.read_text(encoding="utf-8")
+    return _cached_response(
+        request, ANALYSIS_HTML, _ANALYSIS_HTML_ETAG, "text/html; charset=utf-8", HTML_CACHE_CONTROL
+    )
 
 
 @app.post("/api/search", response_model=SearchResponse)
-def search_movies(request: SearchRequest) -> SearchResponse:
+def search_movies(request: SearchRequest, fast: bool = False) -> Union[SearchResponse, ORJSONResponse]:
     prompt = request.prompt.strip()
     if not prompt:
         raise HTTPException(status_code=400, detail="Prompt must not be empty")
 
     hits = rag.search(prompt, top_k=request.top_k)
+    if fast:
+        # Hit details are already plain dicts; skip the Pydantic round trip.
+        return ORJSONResponse(
+            {
+                "results": [
+                    {
+                        "title": hit.title,
+                        "genre": _safe_str(hit.details.get("genre")),
+                        "release_year": _safe_int(hit.details.get("Release Year")),
+                        "score": hit.score,
+                        "payload": hit.details,
+                    }
+                    for hit in hits
+                ]
+            }
+        )
+
     results = [
         MovieResult(
             title=hit.title,
@@ -88,8 +155,24 @@ def search_movies(request: SearchRequest) -> SearchResponse:
 
 
 @app.get("/api/analysis")
-def get_analysis_summary() -> Dict[str, Any]:
-    return analytics.summary_payload()
+def get_analysis_summary(request: Request) -> Response:
+    return _cached_response(request, _ANALYSIS_BODY, _ANALYSIS_ETAG, "application/json", ANALYSIS_CACHE_CONTROL)
+
+
+def _cached_response(request: Request, body: bytes, etag: str, media_type: str, cache_control: str) -> Response:
+    """Serve a precomputed body, answering 304 when the client already holds this ETag."""
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type=media_type, headers=headers)
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return "*" in candidates or etag in candidates
 
 
 def _safe_str(value: Any) -> Optional[str]:
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import List, Optional
+
+import pandas as pd
+import polars as pl
+
+
+DATASET_PATH = Path(__file__).with_name("movies_dataset.csv")
+
+
+def ensure_parquet(dataset_path: Path = DATASET_PATH) -> Path:
+    """Convert the CSV dataset to Parquet once, refreshing it whenever the CSV changes."""
+    parquet_path = dataset_path.with_suffix(".parquet")
+    if parquet_path.exists() and parquet_path.stat().st_mtime_ns >= dataset_path.stat().st_mtime_ns:
+        return parquet_path
+
+    tmp_path = parquet_path.with_name(f"{parquet_path.name}.{os.getpid()}.tmp")
+    # Infer types from every row: a dirty value past the default 100-row sample would otherwise
+    # abort the read. Such columns stay strings and are coerced by the consumers.
+    pl.read_csv(dataset_path, infer_schema_length=None).write_parquet(tmp_path, compression="zstd")
+    os.replace(tmp_path, parquet_path)
+    return parquet_path
+
+
+def scan_movies(dataset_path: Path = DATASET_PATH) -> pl.LazyFrame:
+    """Lazily scan the Parquet copy of the dataset so projections and filters are pushed down."""
+    return pl.scan_parquet(ensure_parquet(dataset_path))
+
+
+def load_movies(dataset_path: Path = DATASET_PATH, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """Load the movie dataset, reading only ``columns`` when provided."""
+    if not dataset_path.exists():
+        raise FileNotFoundError(f"Dataset not found: {dataset_path}")
+
+    frame = scan_movies(dataset_path)
+    if columns is not None:
+        frame = frame.select(columns)
+    return frame.collect().to_pandas()
+
+
+__all__ = [
+    "DATASET_PATH",
+    "ensure_parquet",
+    "load_movies",
+    "scan_movies",
+]
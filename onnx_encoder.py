@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import warnings
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+
+try:
+    import onnxruntime as ort  # type: ignore
+    from huggingface_hub import hf_hub_download  # type: ignore
+    from huggingface_hub.utils import EntryNotFoundError  # type: ignore
+    from transformers import AutoTokenizer  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    ort = None  # type: ignore
+    AutoTokenizer = None  # type: ignore
+
+try:
+    from optimum.onnxruntime import ORTModelForFeatureExtraction, ORTQuantizer  # type: ignore
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    ORTModelForFeatureExtraction = None  # type: ignore
+
+
+QUANTIZED_MODEL_FILE = "model_quantized.onnx"
+SENTENCE_CONFIG_FILE = "sentence_bert_config.json"
+# Written when a model can't be exported so later startups skip straight to SentenceTransformer.
+UNSUPPORTED_MARKER = "unsupported"
+# Module types this encoder reproduces: a transformer, mean pooling, and optional L2 normalisation.
+SUPPORTED_MODULES = {"Transformer", "Pooling", "Normalize"}
+
+
+def _model_id(model_name: str) -> str:
+    if "/" in model_name or Path(model_name).is_dir():
+        return model_name
+    return f"sentence-transformers/{model_name}"
+
+
+def _model_dir(cache_dir: Path, model_name: str) -> Path:
+    return cache_dir / f"{_model_id(model_name).replace('/', '_')}-int8-onnx"
+
+
+def _model_file(model_id: str, filename: str) -> Path:
+    if Path(model_id).is_dir():
+        return Path(model_id) / filename
+    return Path(hf_hub_download(repo_id=model_id, filename=filename))
+
+
+def _sentence_config(model_id: str) -> Dict[str, Any]:
+    """The model's sentence_bert_config.json (holds max_seq_length), or {} when it has none."""
+    try:
+        config_file = _model_file(model_id, SENTENCE_CONFIG_FILE)
+    except EntryNotFoundError:
+        return {}
+    if not config_file.exists():
+        return {}
+    return json.loads(config_file.read_text(encoding="utf-8"))
+
+
+def _uses_mean_pooling(model_id: str) -> bool:
+    """Whether the SentenceTransformer pipeline is exactly transformer -> mean pooling (-> normalize)."""
+    modules = json.loads(_model_file(model_id, "modules.json").read_text(encoding="utf-8"))
+    module_types = {module["type"].rsplit(".", 1)[-1]: module["path"] for module in modules}
+    if not module_types.keys() <= SUPPORTED_MODULES or "Pooling" not in module_types:
+        return False
+
+    pooling_file = _model_file(model_id, f"{module_types['Pooling']}/config.json")
+    pooling = json.loads(pooling_file.read_text(encoding="utf-8"))
+    modes = {key: value for key, value in pooling.items() if key.startswith("pooling_mode_")}
+    return bool(modes.pop("pooling_mode_mean_tokens", False)) and not any(modes.values())
+
+
+class OnnxSentenceEncoder:
+    """Drop-in replacement for ``SentenceTransformer.encode`` backed by an int8 ONNX Runtime session."""
+
+    backend = "onnx-int8"
+
+    def __init__(self, model_name: str, cache_dir: Path) -> None:
+        self.model_id = _model_id(model_name)
+        self.model_dir = _model_dir(cache_dir, model_name)
+        model_path = self.model_dir / QUANTIZED_MODEL_FILE
+        if not model_path.exists():
+            self._export_quantized()
+
+        # Truncate exactly like SentenceTransformer; None falls back to the tokenizer's own limit.
+        config_file = self.model_dir / SENTENCE_CONFIG_FILE
+        if not config_file.exists():  # exports made before the config was saved alongside
+            config_file.write_text(json.dumps(_sentence_config(self.model_id)), encoding="utf-8")
+        sentence_config = json.loads(config_file.read_text(encoding="utf-8"))
+        self.max_seq_length: Optional[int] = sentence_config.get("max_seq_length")
+
+        self.tokenizer = AutoTokenizer.from_pretrained(self.model_dir)
+
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = max(1, (os.cpu_count() or 2) // 2)
+        self.session = ort.InferenceSession(
+            str(model_path),
+            sess_options=options,
+            providers=["CPUExecutionProvider"],
+        )
+        self._input_names = [node.name for node in self.session.get_inputs()]
+
+    @classmethod
+    def load(cls, model_name: str, cache_dir: Path) -> Optional["OnnxSentenceEncoder"]:
+        """Return an ONNX encoder, or None when the model or environment can't be served by one."""
+        if ort is None:
+            return None
+        if (_model_dir(cache_dir, model_name) / UNSUPPORTED_MARKER).exists():
+            return None
+        try:
+            return cls(model_name, cache_dir)
+        except Exception as exc:  # noqa: BLE001 - any export/load failure falls back to PyTorch
+            warnings.warn(f"ONNX encoder unavailable for {model_name!r}, using SentenceTransformer: {exc}")
+            return None
+
+    def _export_quantized(self) -> None:
+        """Export the transformer to ONNX once and quantize it to int8 for VNNI-capable CPUs."""
+        if ORTModelForFeatureExtraction is None:
+            raise RuntimeError("optimum[onnxruntime] package not available. Install it to export the encoder.")
+        try:
+            if not _uses_mean_pooling(self.model_id):
+                raise ValueError("only transformer + mean pooling models can be exported")
+
+            self.model_dir.mkdir(parents=True, exist_ok=True)
+            model = ORTModelForFeatureExtraction.from_pretrained(self.model_id, export=True)
+            AutoTokenizer.from_pretrained(self.model_id).save_pretrained(self.model_dir)
+            (self.model_dir / SENTENCE_CONFIG_FILE).write_text(
+                json.dumps(_sentence_config(self.model_id)), encoding="utf-8"
+            )
+
+            # The quantized model file is written last, so its presence marks a complete export.
+            quantizer = ORTQuantizer.from_pretrained(model)
+            quantizer.quantize(
+                save_dir=self.model_dir,
+                quantization_config=AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False),
+            )
+        except Exception as exc:
+            shutil.rmtree(self.model_dir, ignore_errors=True)
+            self.model_dir.mkdir(parents=True, exist_ok=True)
+            (self.model_dir / UNSUPPORTED_MARKER).write_text(f"{exc}\n", encoding="utf-8")
+            raise
+
+    def encode(
+        self,
+        sentences: Union[str, List[str]],
+        batch_size: int = 32,
+        convert_to_numpy: bool = True,
+        show_progress_bar: bool = False,
+    ) -> np.ndarray:
+        """Return mean-pooled, L2-normalised embeddings (1-D for a single string, 2-D otherwise)."""
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+
+        batches: List[np.ndarray] = []
+        for start in range(0, len(texts), batch_size):
+            tokens = self.tokenizer(
+                texts[start : start + batch_size],
+                padding=True,
+                truncation=True,
+                max_length=self.max_seq_length,
+                return_tensors="np",
+            )
+            feeds = {
+                name: tokens[name].astype(np.int64)
+                if name in tokens
+                else np.zeros_like(tokens["input_ids"], dtype=np.int64)
+                for name in self._input_names
+            }
+            token_embeddings = self.session.run(None, feeds)[0]
+
+            mask = tokens["attention_mask"][..., None].astype(np.float32)
+            pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            pooled /= np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+            batches.append(pooled.astype(np.float32))
+
+        vectors = np.vstack(batches) if batches else np.empty((0, 0), dtype=np.float32)
+        return vectors[0] if single else vectors
+
+
+__all__ = ["OnnxSentenceEncoder"]
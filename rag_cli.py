@@ -1,29 +1,35 @@
 from __future__ import annotations
 
 import argparse
+import functools
 import hashlib
 import json
 import os
 import sys
+import threading
+from concurrent.futures import Future
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Union
 
 import numpy as np
 import pandas as pd
-from qdrant_client import QdrantClient, models
+import torch
 from sentence_transformers import SentenceTransformer
 
+from io_utils import DATASET_PATH, load_movies
+from onnx_encoder import OnnxSentenceEncoder
+
 try:
     from openai import OpenAI  # type: ignore
 except ImportError:  # pragma: no cover - optional dependency
     OpenAI = None  # type: ignore
 
 
-DATASET_PATH = Path(__file__).with_name("movies_dataset.csv")
 CACHE_DIR = Path(__file__).parent / ".cache"
 COLLECTION_NAME = "top_movies"
 DEFAULT_ENCODER_NAME = "all-MiniLM-L6-v2"
+QUERY_CACHE_SIZE = 1024
 
 
 @dataclass
@@ -43,44 +49,53 @@ class MovieRAG:
         dataset_path: Path = DATASET_PATH,
         encoder_name: str = DEFAULT_ENCODER_NAME,
         collection_name: str = COLLECTION_NAME,
+        dataframe: Optional[pd.DataFrame] = None,
     ) -> None:
         self.dataset_path = dataset_path
         self.encoder_name = encoder_name
         self.collection_name = collection_name
+        self._sig_cache: Optional[str] = None
+        self._inflight: Dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
+        # Per-instance cache so it neither leaks instances nor is shared between them.
+        self._encode_prompt = functools.lru_cache(maxsize=QUERY_CACHE_SIZE)(self._encode_prompt_uncached)
 
-        if not self.dataset_path.exists():
-            raise FileNotFoundError(f"Dataset not found: {self.dataset_path}")
-
-        self.dataframe = pd.read_csv(self.dataset_path)
-        self.records = self.dataframe.to_dict("records")
+        self.dataframe = dataframe if dataframe is not None else load_movies(self.dataset_path)
 
         self.encoder = self._load_encoder()
-        self.client = self._create_client()
+        self._corpus: np.ndarray = np.empty((0, 0), dtype=np.float32)
 
-        self._ensure_collection()
+        self._ensure_index()
 
-    def _load_encoder(self) -> SentenceTransformer:
-        """Load the sentence transformer encoder (cached by transformers)."""
-        return SentenceTransformer(self.encoder_name)
+    def _load_encoder(self) -> Union[OnnxSentenceEncoder, SentenceTransformer]:
+        """Load the int8 ONNX encoder when available, else the sentence transformer (cached by transformers)."""
+        onnx_encoder = OnnxSentenceEncoder.load(self.encoder_name, CACHE_DIR)
+        if onnx_encoder is not None:
+            return onnx_encoder
+        torch.set_num_threads(os.cpu_count() or 1)
+        # sentence-transformers 2.7 loads the fast (Rust) tokenizer via AutoTokenizer by default.
+        return SentenceTransformer(self.encoder_name, device="cpu")
 
-    def _create_client(self) -> QdrantClient:
-        """Create an in-memory Qdrant client."""
-        return QdrantClient(":memory:")
+    @property
+    def encoder_backend(self) -> str:
+        return getattr(self.encoder, "backend", "sentence-transformers")
 
     # region cache helpers
     def _cache_files(self) -> tuple[Path, Path]:
         CACHE_DIR.mkdir(exist_ok=True)
         base_name = f"{self.collection_name}_{self.encoder_name.replace('/', '_')}"
-        vectors_file = CACHE_DIR / f"{base_name}.npz"
+        vectors_file = CACHE_DIR / f"{base_name}.npy"
         meta_file = CACHE_DIR / f"{base_name}.json"
         return vectors_file, meta_file
 
     def _dataset_signature(self) -> str:
-        hash_digest = hashlib.sha256()
-        with self.dataset_path.open("rb") as dataset_file:
-            for chunk in iter(lambda: dataset_file.read(1 << 20), b""):
-                hash_digest.update(chunk)
-        return hash_digest.hexdigest()
+        """SHA-256 over the rows actually embedded, so an injected DataFrame gets its own cache key."""
+        if self._sig_cache is None:
+            hash_digest = hashlib.sha256("\x1f".join(map(str, self.dataframe.columns)).encode("utf-8"))
+            row_hashes = pd.util.hash_pandas_object(self.dataframe, index=False).to_numpy()
+            hash_digest.update(row_hashes.tobytes())
+            self._sig_cache = hash_digest.hexdigest()
+        return self._sig_cache
 
     def _load_cached_vectors(self) -> Optional[np.ndarray]:
         vectors_file, meta_file = self._cache_files()
@@ -90,93 +105,135 @@ class MovieRAG:
         with meta_file.open("r", encoding="utf-8") as meta_fh:
             metadata = json.load(meta_fh)
 
-        if metadata.get("dataset_signature") != self._dataset_signature():
-            return None
+        # Cheap fields first so a mismatch never pays for hashing the dataset.
+        point_count = len(self.dataframe)
         if metadata.get("encoder_name") != self.encoder_name:
             return None
+        if metadata.get("encoder_backend", "sentence-transformers") != self.encoder_backend:
+            return None
+        if metadata.get("dtype") != "float32":
+            return None
+        if metadata.get("point_count") != point_count:
+            return None
+        if metadata.get("dataset_signature") != self._dataset_signature():
+            return None
 
-        npz = np.load(vectors_file)
-        return npz["vectors"]
+        # Memory-mapped so startup skips parsing and forked workers share the pages.
+        vectors = np.load(vectors_file, mmap_mode="r")
+        if vectors.shape != (point_count, metadata.get("vector_dim")):
+            return None
+        return vectors
 
     def _persist_vectors(self, vectors: np.ndarray) -> None:
         vectors_file, meta_file = self._cache_files()
-        np.savez_compressed(vectors_file, vectors=vectors)
+        # Write to temp files and rename into place so workers that have the old .npy mapped,
+        # or start mid-write, never see a truncated file.
+        tmp_suffix = f".{os.getpid()}.tmp"
+        tmp_vectors = vectors_file.with_name(vectors_file.name + tmp_suffix)
+        with tmp_vectors.open("wb") as vectors_fh:
+            np.save(vectors_fh, vectors)
+        os.replace(tmp_vectors, vectors_file)
+
         metadata = {
             "dataset_signature": self._dataset_signature(),
             "encoder_name": self.encoder_name,
+            "encoder_backend": self.encoder_backend,
             "vector_dim": int(vectors.shape[1]),
+            "point_count": int(vectors.shape[0]),
+            "dtype": "float32",
         }
-        with meta_file.open("w", encoding="utf-8") as meta_fh:
+        tmp_meta = meta_file.with_name(meta_file.name + tmp_suffix)
+        with tmp_meta.open("w", encoding="utf-8") as meta_fh:
             json.dump(metadata, meta_fh, indent=2)
+        os.replace(tmp_meta, meta_file)
 
     # endregion
 
-    def _ensure_collection(self) -> None:
+    def _ensure_index(self) -> None:
+        """Keep the embeddings as one L2-normalised float32 matrix for cosine top-k scans."""
         vectors = self._load_cached_vectors()
         if vectors is None:
-            movie_texts = [self._record_to_text(record) for record in self.records]
+            movie_texts = self._movie_texts()
             vectors = self.encoder.encode(
                 movie_texts,
                 batch_size=128,
                 convert_to_numpy=True,
                 show_progress_bar=True,
             )
+            vectors = np.asarray(vectors, dtype=np.float32)
+            vectors /= np.clip(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12, None)
             self._persist_vectors(vectors)
 
-        vector_dim = vectors.shape[1]
-
-        if self.client.collection_exists(self.collection_name):
-            self.client.delete_collection(self.collection_name)
-
-        self.client.create_collection(
-            collection_name=self.collection_name,
-            vectors_config=models.VectorParams(
-                size=vector_dim,
-                distance=models.Distance.COSINE,
-            ),
-        )
-
-        self.client.upload_points(
-            collection_name=self.collection_name,
-            points=[
-                models.PointStruct(
-                    id=idx,
-                    vector=vectors[idx].tolist(),
-                    payload=self.records[idx],
-                )
-                for idx in range(len(self.records))
-            ],
+        self._corpus = vectors
+
+    def _movie_texts(self) -> List[str]:
+        """Build the text embedded for each movie in one vectorised pass over the columns."""
+        df = self.dataframe
+        genre = df["genre"].fillna("").astype(str)
+        year = pd.to_numeric(df["Release Year"], errors="coerce").astype("Int64")
+        profit = pd.to_numeric(df["Profit"], errors="coerce")
+        texts = (
+            df["Movie Name"].fillna("").astype(str)
+            + np.where(genre != "", ". genre: " + genre, "")
+            + np.where(year.notna(), ". released: " + year.astype(str), "")
+            + np.where(profit.notna(), ". profit: " + profit.astype(str), "")
         )
+        return texts.tolist()
+
+    def warm_up(self) -> None:
+        """Run one throwaway query so the first real request doesn't pay for lazy initialisation."""
+        self.search("warmup", top_k=1)
+
+    def _encode_prompt_uncached(self, prompt: str) -> np.ndarray:
+        """Encode and L2-normalise a query; ~1.5 KB per cached entry."""
+        query_vector = np.asarray(self.encoder.encode(prompt), dtype=np.float32)
+        query_vector /= max(float(np.linalg.norm(query_vector)), 1e-12)
+        query_vector.flags.writeable = False
+        return query_vector
+
+    def _encode_query(self, prompt: str) -> np.ndarray:
+        """Serve repeated prompts from the LRU cache and coalesce identical in-flight encodes."""
+        key = prompt.strip()
+        with self._inflight_lock:
+            pending = self._inflight.get(key)
+            if pending is None:
+                future: Future = Future()
+                self._inflight[key] = future
+        if pending is not None:
+            return pending.result()
 
-    def _record_to_text(self, record: Dict[str, Any]) -> str:
-        parts = [str(record.get("Movie Name", ""))]
-        genre = record.get("genre")
-        if genre:
-            parts.append(f"genre: {genre}")
-        year = record.get("Release Year")
-        if not pd.isna(year):
-            parts.append(f"released: {int(year)}")
-        profit = record.get("Profit")
-        if not pd.isna(profit):
-            parts.append(f"profit: {profit}")
-        return ". ".join(parts)
+        try:
+            result = self._encode_prompt(key)
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(result)
+        finally:
+            with self._inflight_lock:
+                del self._inflight[key]
+        return result
 
     def search(self, prompt: str, top_k: int = 3) -> List[MovieHit]:
-        query_vector = self.encoder.encode(prompt).tolist()
-        hits = self.client.search(
-            collection_name=self.collection_name,
-            query_vector=query_vector,
-            limit=top_k,
-            with_payload=True,
-        )
-        return [
-            MovieHit(
-                title=hit.payload.get("Movie Name", "<unknown>"),
-                details=hit.payload,
-                score=float(hit.score),
+        top_k = min(top_k, len(self._corpus))
+        if top_k <= 0:
+            return []
+
+        scores = self._corpus @ self._encode_query(prompt)
+        top_idx = np.argpartition(-scores, top_k - 1)[:top_k]
+        top_idx = top_idx[np.argsort(-scores[top_idx])]
+        hits = []
+        for idx in top_idx:
+            # Row dicts are built only for returned hits; the DataFrame stays the single store.
+            details = self.dataframe.iloc[idx].to_dict()
+            hits.append(
+                MovieHit(
+                    title=details.get("Movie Name", "<unknown>"),
+                    details=details,
+                    score=float(scores[idx]),
+                )
             )
-            for hit in hits
-        ]
+        return hits
 
 
 def summarise_hits(
@@ -223,7 +280,7 @@ def summarise_hits(
 
 def _parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(
-        description="Movie recommendation CLI powered by SentenceTransformers and Qdrant.",
+        description="Movie recommendation CLI powered by SentenceTransformers and NumPy cosine search.",
     )
     parser.add_argument(
         "--prompt",